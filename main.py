@@ -1,44 +1,347 @@
 import os
 import json
+import math
+import re
 import shutil
+import stat
 import hashlib
+import mmap
 import logging
+import logging.handlers
+import atexit
+import secrets
+import contextlib
+import functools
+import asyncio
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import zipfile
 import csv
+import fnmatch
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pcsv
+except ImportError:
+    pa = None
+    pc = None
+    pcsv = None
+
+try:
+    from fastcdc import fastcdc
+except ImportError:
+    fastcdc = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# Hash uchun o'qish bo'lagi (1 MiB) - syscall sonini kamaytiradi
+_HASH_CHUNK = 1 << 20
+
+# Bundan kichik fayllar mmap'siz, bitta read bilan hashlanadi
+_SMALL_HASH_SIZE = 128 * 1024
+
+# Bundan katta matn BufferedWriter'siz, shu o'lchamdagi bo'laklar bilan yoziladi
+_WRITE_CHUNK = 1 << 20
+
+# Statistika uchun parallel skanerlash oqimlari soni
+_STATS_WORKERS = 8
+
+# Linux FICLONE ioctl - copy-on-write nusxa (Btrfs, XFS)
+_FICLONE = 0x40049409
+_KERNEL_COPY = fcntl is not None or hasattr(os, 'copy_file_range')
+
+# Bundan ko'p qatorli CSV'lar pyarrow orqali yoziladi
+_ARROW_CSV_MIN_ROWS = 1000
+
+# 19+ raqamli son 64 bitga sig'masligi mumkin - orjson uni float qilib o'qiydi
+_LONG_NUMBER = re.compile(rb'\d{19,}')
+
+# Deduplikatsiyali backup uchun bo'lak o'lchamlari (content-defined chunking)
+_CDC_MIN_SIZE = 16 * 1024
+_CDC_AVG_SIZE = 64 * 1024
+_CDC_MAX_SIZE = 256 * 1024
+
+# Allaqachon siqilgan formatlar - ZIP'da qayta siqilmaydi
+_INCOMPRESSIBLE = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.mp3', '.mp4', '.mkv', '.avi',
+    '.zip', '.gz', '.bz2', '.xz', '.7z', '.rar', '.docx', '.xlsx', '.pdf'
+}
+
+
+def _file_size(path) -> Optional[int]:
+    """Oddiy fayl hajmi, fayl bo'lmasa None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size if stat.S_ISREG(st.st_mode) else None
+
+
+def _write_text(path, content: str):
+    """Matnni UTF-8 da yozish; katta matn bir marta kodlanib os.write bilan yoziladi"""
+    if len(content) <= _WRITE_CHUNK:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return
+    
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    payload = memoryview(content.encode('utf-8'))
+    
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(path, flags, 0o666)
+    try:
+        offset = 0
+        while offset < len(payload):
+            offset += os.write(fd, payload[offset:offset + _WRITE_CHUNK])
+    finally:
+        os.close(fd)
+
+
+def _kernel_copy(src, dst) -> bool:
+    """Reflink yoki copy_file_range orqali nusxalash, imkon bo'lmasa False"""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                return True
+            except OSError:
+                pass
+        
+        if hasattr(os, 'copy_file_range'):
+            try:
+                size = os.fstat(fsrc.fileno()).st_size
+                remaining = size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        # Boshida 0 qaytsa copy_file_range ishlamagan (shutil ham shunday qiladi),
+                        # keyinroq 0 esa fayl qisqarganini bildiradi
+                        if remaining == size:
+                            fdst.truncate(0)
+                            return False
+                        break
+                    remaining -= copied
+                return True
+            except OSError:
+                fdst.truncate(0)
+    return False
+
+
+@contextlib.contextmanager
+def _atomic_open(path, mode: str = 'w', **kwargs):
+    """Vaqtinchalik faylga yozib, oxirida os.replace bilan almashtirish (yarim yozilgan fayl qolmaydi)"""
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    fd = os.open(tmp_path, flags, 0o666)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def _has_non_finite(data) -> bool:
+    """Ma'lumotda NaN yoki Infinity bormi (orjson ularni null qilib yozadi)"""
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def _csv_arrow_table(data: List[List], headers: Optional[List[str]]):
+    """Satrli jadvalni Arrow jadvaliga aylantirish; csv.writer bilan bir xil chiqmasa None"""
+    width = len(headers) if headers else len(data[0])
+    # Bitta ustunli bo'sh qiymatni csv.writer '""' deb yozadi
+    if width < 2:
+        return None
+    names = [str(name) for name in headers] if headers else [f"f{i}" for i in range(width)]
+    if any(char in name for name in names for char in ',"\r\n'):
+        return None
+    
+    # Qatorlar C darajasida bitta list<string> massiviga o'tadi (transpozitsiyasiz).
+    # Faqat str/None: int, float, bool'ni Arrow csv.writer'dan boshqacha yozadi
+    try:
+        rows = pa.array(data, type=pa.list_(pa.string()))
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        return None
+    
+    lengths = pc.min_max(pc.list_value_length(rows)).as_py()
+    if rows.null_count or lengths['min'] != width or lengths['max'] != width:
+        return None
+    
+    # Qo'shtirnoq kerak bo'ladigan qiymatlar bo'lsa, csv moduli yozadi.
+    # Barcha qiymatlar bitta UTF-8 buferda - bayt qidiruvi regex'dan ancha tez
+    data_buffer = rows.flatten().buffers()[2]
+    if data_buffer is not None:
+        raw = data_buffer.to_pybytes()
+        if any(char in raw for char in (b',', b'"', b'\r', b'\n')):
+            return None
+    
+    columns = [pc.list_element(rows, k) for k in range(width)]
+    return pa.Table.from_arrays(columns, names=names)
+
+
+def _write_csv_arrow(output, table, include_header: bool):
+    """Arrow jadvalini csv.writer bilan bir xil formatda yozish"""
+    pcsv.write_csv(table, output, write_options=pcsv.WriteOptions(
+        include_header=include_header,
+        eol="\r\n",
+        quoting_style="none",
+        quoting_header="none"
+    ))
+
+
+def _zip_target(extract_path: str, arcname: str) -> Optional[str]:
+    """ZIP a'zosi uchun xavfsiz yo'l (ZipFile.extractall kabi: absolyut yo'l va '..' olib tashlanadi)"""
+    arcname = arcname.replace('/', os.sep)
+    if os.altsep:
+        arcname = arcname.replace(os.altsep, os.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [x for x in arcname.split(os.sep) if x not in ('', os.curdir, os.pardir)]
+    if not parts:
+        return None
+    return os.path.join(extract_path, *parts)
+
+
+def _tracked_write(method):
+    """Metodni FileManager._write_section ichida bajarish (statistika keshi uchun)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_section():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _event_loop_running() -> bool:
+    """Joriy oqimda asyncio loop ishlayaptimi (unda asyncio.run chaqirib bo'lmaydi)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _copy_destination(src, dst) -> str:
+    """shutil.copy2 kabi: manzil papka bo'lsa, fayl uning ichiga shu nom bilan nusxalanadi"""
+    if os.path.isdir(dst):
+        return os.path.join(dst, os.path.basename(src))
+    return os.fspath(dst)
+
+
+def _fast_copy(src, dst) -> str:
+    """Faylni metadata bilan nusxalash (shutil.copy2 o'rniga), yakuniy manzilni qaytaradi"""
+    dst = _copy_destination(src, dst)
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src} va {dst} bir xil fayl")
+    # shutil.copyfile o'zi sendfile (Linux) yoki fcopyfile (macOS) ishlatadi
+    if not (_KERNEL_COPY and _kernel_copy(src, dst)):
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+    return dst
 
 
 class FileManager:
     """Professional fayl boshqaruv klassi"""
     
-    def __init__(self, base_dir: str = "file_storage"):
+    def __init__(self, base_dir: str = "file_storage", dedup_backups: bool = False):
         self.base_dir = Path(base_dir)
+        # True bo'lsa backuplar bo'laklarga ajratilib, takrorlanmas holda saqlanadi
+        self.dedup_backups = dedup_backups
         self.base_dir.mkdir(exist_ok=True)
+        # Tez-tez chaqiriladigan metodlar uchun yo'llar satr sifatida quriladi
+        self._base = os.fspath(self.base_dir)
+        # Loglardan tashqari fayllar soni/hajmi; birinchi so'rovda to'ldiriladi
+        self._stats: Optional[Dict[str, int]] = None
+        # Skanerlash paytida yozishlar kutadi, aks holda o'zgarish ikki marta sanalishi yoki yo'qolishi mumkin
+        self._stats_cond = threading.Condition()
+        self._active_writes = 0
+        self._scanning = False
         self._setup_logging()
         
     def _setup_logging(self):
         """Logging tizimini sozlash"""
-        log_dir = self.base_dir / "logs"
-        log_dir.mkdir(exist_ok=True)
+        self.log_dir = self.base_dir / "logs"
+        self.log_dir.mkdir(exist_ok=True)
+        self._log_prefix = os.path.join(os.path.abspath(self.log_dir), "")
         
-        logging.basicConfig(
-            filename=log_dir / f"file_manager_{datetime.now().strftime('%Y%m%d')}.log",
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
         self.logger = logging.getLogger(__name__)
+        if self.logger.handlers:
+            return
+        
+        file_handler = logging.FileHandler(
+            self.log_dir / f"file_manager_{datetime.now().strftime('%Y%m%d')}.log",
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        
+        # Yozuvlar 512 tadan yig'ilib yoziladi, ERROR darhol yoziladi
+        memory_handler = logging.handlers.MemoryHandler(
+            capacity=512,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        )
+        self.logger.addHandler(memory_handler)
+        self.logger.setLevel(logging.INFO)
+        # atexit teskari tartibda ishlaydi: avval flush, keyin fayl yopiladi
+        atexit.register(file_handler.close)
+        atexit.register(memory_handler.flush)
+    
+    def _p(self, subdir: str, name: str) -> str:
+        """base_dir/subdir/name yo'lini satr sifatida qurish"""
+        if subdir:
+            return os.path.join(self._base, subdir, name)
+        return os.path.join(self._base, name)
     
+    @_tracked_write
     def create_file(self, filename: str, content: str, subdir: str = "") -> bool:
         """Yangi fayl yaratish"""
         try:
-            file_path = self.base_dir / subdir / filename
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path = self._p(subdir, filename)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            old_size = _file_size(file_path)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            _write_text(file_path, content)
             
+            self._stats_adjust(file_path, old_size, _file_size(file_path))
             self.logger.info(f"Fayl yaratildi: {file_path}")
             return True
         except Exception as e:
@@ -48,7 +351,7 @@ class FileManager:
     def read_file(self, filename: str, subdir: str = "") -> Optional[str]:
         """Faylni o'qish"""
         try:
-            file_path = self.base_dir / subdir / filename
+            file_path = self._p(subdir, filename)
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             self.logger.info(f"Fayl o'qildi: {file_path}")
@@ -57,32 +360,37 @@ class FileManager:
             self.logger.error(f"Faylni o'qishda xatolik: {e}")
             return None
     
+    @_tracked_write
     def update_file(self, filename: str, content: str, subdir: str = "") -> bool:
         """Faylni yangilash"""
         try:
-            file_path = self.base_dir / subdir / filename
-            if not file_path.exists():
+            file_path = self._p(subdir, filename)
+            if not os.path.exists(file_path):
                 self.logger.warning(f"Fayl topilmadi: {file_path}")
                 return False
             
             # Backup yaratish
             self._create_backup(file_path)
+            old_size = _file_size(file_path)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            _write_text(file_path, content)
             
+            self._stats_adjust(file_path, old_size, _file_size(file_path))
             self.logger.info(f"Fayl yangilandi: {file_path}")
             return True
         except Exception as e:
             self.logger.error(f"Faylni yangilashda xatolik: {e}")
             return False
     
+    @_tracked_write
     def delete_file(self, filename: str, subdir: str = "") -> bool:
         """Faylni o'chirish"""
         try:
-            file_path = self.base_dir / subdir / filename
-            if file_path.exists():
-                file_path.unlink()
+            file_path = self._p(subdir, filename)
+            if os.path.exists(file_path):
+                old_size = _file_size(file_path)
+                os.unlink(file_path)
+                self._stats_adjust(file_path, old_size, None)
                 self.logger.info(f"Fayl o'chirildi: {file_path}")
                 return True
             return False
@@ -90,28 +398,41 @@ class FileManager:
             self.logger.error(f"Faylni o'chirishda xatolik: {e}")
             return False
     
+    @_tracked_write
     def copy_file(self, source: str, destination: str, subdir: str = "") -> bool:
         """Faylni nusxalash"""
         try:
-            src_path = self.base_dir / subdir / source
-            dst_path = self.base_dir / subdir / destination
-            dst_path.parent.mkdir(parents=True, exist_ok=True)
+            src_path = self._p(subdir, source)
+            dst_path = self._p(subdir, destination)
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            dst_path = _copy_destination(src_path, dst_path)
             
-            shutil.copy2(src_path, dst_path)
+            old_size = _file_size(dst_path)
+            
+            _fast_copy(src_path, dst_path)
+            self._stats_adjust(dst_path, old_size, _file_size(dst_path))
             self.logger.info(f"Fayl nusxalandi: {src_path} -> {dst_path}")
             return True
         except Exception as e:
             self.logger.error(f"Faylni nusxalashda xatolik: {e}")
             return False
     
+    @_tracked_write
     def move_file(self, source: str, destination: str, subdir: str = "") -> bool:
         """Faylni ko'chirish"""
         try:
-            src_path = self.base_dir / subdir / source
-            dst_path = self.base_dir / subdir / destination
-            dst_path.parent.mkdir(parents=True, exist_ok=True)
+            src_path = self._p(subdir, source)
+            dst_path = self._p(subdir, destination)
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            # shutil.move ham papka manzilga shu nom bilan ko'chiradi
+            dst_path = _copy_destination(src_path, dst_path)
+            
+            src_size = _file_size(src_path)
+            old_size = _file_size(dst_path)
             
-            shutil.move(str(src_path), str(dst_path))
+            shutil.move(src_path, dst_path)
+            self._stats_adjust(src_path, src_size, None)
+            self._stats_adjust(dst_path, old_size, _file_size(dst_path))
             self.logger.info(f"Fayl ko'chirildi: {src_path} -> {dst_path}")
             return True
         except Exception as e:
@@ -122,18 +443,19 @@ class FileManager:
         """Fayl haqida ma'lumot olish"""
         try:
             file_path = self.base_dir / subdir / filename
-            if not file_path.exists():
+            try:
+                stats = file_path.stat()
+            except FileNotFoundError:
                 return None
             
-            stats = file_path.stat()
             return {
                 'name': filename,
                 'size': stats.st_size,
                 'size_mb': round(stats.st_size / (1024 * 1024), 2),
-                'created': datetime.fromtimestamp(stats.st_ctime).strftime('%Y-%m-%d %H:%M:%S'),
-                'modified': datetime.fromtimestamp(stats.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+                'created': datetime.fromtimestamp(stats.st_ctime).isoformat(sep=' ', timespec='seconds'),
+                'modified': datetime.fromtimestamp(stats.st_mtime).isoformat(sep=' ', timespec='seconds'),
                 'extension': file_path.suffix,
-                'is_file': file_path.is_file(),
+                'is_file': stat.S_ISREG(stats.st_mode),
                 'path': str(file_path)
             }
         except Exception as e:
@@ -143,12 +465,21 @@ class FileManager:
     def list_files(self, subdir: str = "", pattern: str = "*") -> List[str]:
         """Papkadagi fayllar ro'yxati"""
         try:
-            dir_path = self.base_dir / subdir
-            if not dir_path.exists():
+            dir_path = self._p(subdir, "")
+            if not os.path.exists(dir_path):
                 return []
             
-            files = [f.name for f in dir_path.glob(pattern) if f.is_file()]
-            return sorted(files)
+            # Ichki papkali va rekursiv shablonlar ("*/x.txt", "**") uchun glob kerak
+            if "/" in pattern or os.sep in pattern or "**" in pattern:
+                files = [f.name for f in Path(dir_path).glob(pattern) if f.is_file()]
+                return sorted(files)
+            
+            with os.scandir(dir_path) as it:
+                files = [entry.name for entry in it if entry.is_file(follow_symlinks=False)]
+            if pattern != "*":
+                files = fnmatch.filter(files, pattern)
+            files.sort()
+            return files
         except Exception as e:
             self.logger.error(f"Fayllar ro'yxatini olishda xatolik: {e}")
             return []
@@ -156,87 +487,233 @@ class FileManager:
     def search_files(self, keyword: str, subdir: str = "") -> List[str]:
         """Fayllarni qidirish"""
         try:
-            dir_path = self.base_dir / subdir
-            results = []
+            dir_path = os.path.normpath(self._p(subdir, ""))
+            if not os.path.exists(dir_path):
+                return []
+            
+            rel_dir = os.path.relpath(dir_path, self._base)
+            if rel_dir == os.pardir or rel_dir.startswith(os.pardir + os.sep):
+                raise ValueError(f"{dir_path} base_dir ichida emas")
             
-            for file_path in dir_path.rglob("*"):
-                if file_path.is_file() and keyword.lower() in file_path.name.lower():
-                    results.append(str(file_path.relative_to(self.base_dir)))
+            # Natija yo'li = base_dir'ga nisbatan papka + papka ichidagi yo'l
+            rel_prefix = "" if rel_dir == os.curdir else os.path.join(rel_dir, "")
+            dir_prefix_len = len(os.path.join(dir_path, ""))
+            keyword = keyword.lower()
             
-            return results
+            return [
+                rel_prefix + entry.path[dir_prefix_len:]
+                for entry in self._walk_files(dir_path)
+                if keyword in entry.name.lower()
+            ]
         except Exception as e:
             self.logger.error(f"Qidirishda xatolik: {e}")
             return []
     
-    def get_file_hash(self, filename: str, subdir: str = "") -> Optional[str]:
-        """Fayl hash kodini olish (MD5)"""
+    def get_file_hash(self, filename: str, subdir: str = "", algorithm: str = "md5",
+                      use_mmap: bool = True) -> Optional[str]:
+        """Fayl hash kodini olish (fayl parallel yozilayotgan bo'lsa use_mmap=False)"""
         try:
-            file_path = self.base_dir / subdir / filename
-            hash_md5 = hashlib.md5()
+            file_path = self._p(subdir, filename)
+            
+            if algorithm == "blake3":
+                if blake3 is None:
+                    raise ImportError("blake3 paketi o'rnatilmagan")
+                hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+                if use_mmap:
+                    # update_mmap faylni xotiraga akslantiradi va barcha yadrolarda hashlaydi
+                    hasher.update_mmap(file_path)
+                    return hasher.hexdigest()
+            elif algorithm == "xxh3":
+                if xxhash is None:
+                    raise ImportError("xxhash paketi o'rnatilmagan")
+                hasher = xxhash.xxh3_128()
+            else:
+                hasher = hashlib.new(algorithm)
             
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
+            with open(file_path, "rb", buffering=0) as f:
+                size = os.fstat(f.fileno()).st_size
+                if 0 < size < _SMALL_HASH_SIZE:
+                    # Kichik faylda mmap/munmap o'zi hashlashdan qimmatroq
+                    hasher.update(f.read())
+                elif size == 0 or not use_mmap:
+                    # mmap bo'sh fayllarni qabul qilmaydi; use_mmap=False bo'lsa ham bo'laklab o'qiladi
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                        hasher.update(chunk)
+                else:
+                    # Hashlash paytida fayl qisqartirilsa, mmap jarayonni SIGBUS bilan to'xtatadi
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mmap, "MADV_SEQUENTIAL"):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        hasher.update(mm)
             
-            return hash_md5.hexdigest()
+            return hasher.hexdigest()
         except Exception as e:
             self.logger.error(f"Hash olishda xatolik: {e}")
             return None
     
-    def _create_backup(self, file_path: Path):
+    def _create_backup(self, file_path: str):
         """Fayl backupini yaratish"""
-        backup_dir = self.base_dir / "backups"
-        backup_dir.mkdir(exist_ok=True)
+        backup_dir = self._p("", "backups")
+        os.makedirs(backup_dir, exist_ok=True)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_name = f"{file_path.stem}_{timestamp}{file_path.suffix}"
-        backup_path = backup_dir / backup_name
+        stem, suffix = os.path.splitext(os.path.basename(file_path))
+        backup_name = f"{stem}_{timestamp}{suffix}"
+        backup_path = os.path.join(backup_dir, backup_name)
         
-        shutil.copy2(file_path, backup_path)
+        if self.dedup_backups:
+            if fastcdc is not None:
+                self._create_chunked_backup(file_path, backup_path + ".manifest")
+                return
+            self.logger.warning("fastcdc o'rnatilmagan, to'liq backup nusxasi olinadi")
+        
+        old_size = _file_size(backup_path)
+        
+        _fast_copy(file_path, backup_path)
+        self._stats_adjust(backup_path, old_size, _file_size(backup_path))
         self.logger.info(f"Backup yaratildi: {backup_path}")
     
-    def create_zip(self, zip_name: str, files: List[str], subdir: str = "") -> bool:
-        """Fayllarni zip arxivga joylash"""
+    def _create_chunked_backup(self, file_path: str, manifest_path: str):
+        """Backupni bo'laklarga ajratib saqlash (avval saqlangan bo'laklar qayta yozilmaydi)"""
+        objects_dir = self._p("backups", "objects")
+        hashes = []
+        
+        # fastcdc bo'sh faylni mmap qila olmaydi
+        if _file_size(file_path):
+            chunks = fastcdc(file_path, min_size=_CDC_MIN_SIZE, avg_size=_CDC_AVG_SIZE,
+                             max_size=_CDC_MAX_SIZE, fat=True)
+            for chunk in chunks:
+                digest = hashlib.sha256(chunk.data).hexdigest()
+                hashes.append(digest)
+                
+                object_path = os.path.join(objects_dir, digest[:2], digest)
+                if os.path.exists(object_path):
+                    continue
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                tmp_path = object_path + ".tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(chunk.data)
+                os.replace(tmp_path, object_path)
+                self._stats_adjust(object_path, None, chunk.length)
+        
+        old_size = _file_size(manifest_path)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            f.writelines(f"{digest}\n" for digest in hashes)
+        self._stats_adjust(manifest_path, old_size, _file_size(manifest_path))
+        self.logger.info(f"Backup yaratildi: {manifest_path} ({len(hashes)} bo'lak)")
+    
+    @_tracked_write
+    def restore_backup(self, backup_name: str, filename: str, subdir: str = "") -> bool:
+        """Backupdan faylni tiklash (oddiy nusxa yoki .manifest)"""
+        try:
+            backup_path = self._p("backups", backup_name)
+            file_path = self._p(subdir, filename)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            old_size = _file_size(file_path)
+            
+            if backup_name.endswith(".manifest"):
+                objects_dir = self._p("backups", "objects")
+                with open(backup_path, 'r', encoding='utf-8') as f:
+                    hashes = f.read().split()
+                # Barcha bo'laklar o'qilib tekshirilgandan keyingina fayl almashtiriladi
+                with _atomic_open(file_path, 'wb') as out:
+                    for digest in hashes:
+                        with open(os.path.join(objects_dir, digest[:2], digest), 'rb') as f:
+                            chunk = f.read()
+                        if hashlib.sha256(chunk).hexdigest() != digest:
+                            raise ValueError(f"Backup bo'lagi buzilgan: {digest}")
+                        out.write(chunk)
+            else:
+                _fast_copy(backup_path, file_path)
+            
+            self._stats_adjust(file_path, old_size, _file_size(file_path))
+            self.logger.info(f"Backup tiklandi: {backup_path} -> {file_path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Backupni tiklashda xatolik: {e}")
+            return False
+    
+    @_tracked_write
+    def create_zip(self, zip_name: str, files: List[str], subdir: str = "", compresslevel: int = 1) -> bool:
+        """Fayllarni zip arxivga joylash (siqilgan formatlar siqilmasdan saqlanadi)"""
         try:
-            zip_path = self.base_dir / subdir / zip_name
+            zip_path = self._p(subdir, zip_name)
+            old_size = _file_size(zip_path)
             
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zipf:
                 for file in files:
-                    file_path = self.base_dir / subdir / file
-                    if file_path.exists():
-                        zipf.write(file_path, file)
+                    file_path = self._p(subdir, file)
+                    if os.path.exists(file_path):
+                        if os.path.splitext(file)[1].lower() in _INCOMPRESSIBLE:
+                            zipf.write(file_path, file, compress_type=zipfile.ZIP_STORED)
+                        else:
+                            zipf.write(file_path, file)
             
+            self._stats_adjust(zip_path, old_size, _file_size(zip_path))
             self.logger.info(f"ZIP arxiv yaratildi: {zip_path}")
             return True
         except Exception as e:
             self.logger.error(f"ZIP yaratishda xatolik: {e}")
             return False
     
+    @_tracked_write
     def extract_zip(self, zip_name: str, extract_dir: str = "", subdir: str = "") -> bool:
         """ZIP arxivni ochish"""
         try:
-            zip_path = self.base_dir / subdir / zip_name
-            extract_path = self.base_dir / subdir / extract_dir
-            extract_path.mkdir(parents=True, exist_ok=True)
+            zip_path = self._p(subdir, zip_name)
+            extract_path = self._p(subdir, extract_dir)
+            os.makedirs(extract_path, exist_ok=True)
             
             with zipfile.ZipFile(zip_path, 'r') as zipf:
-                zipf.extractall(extract_path)
-            
+                for member in zipf.infolist():
+                    target = _zip_target(extract_path, member.filename)
+                    if target is None:
+                        continue
+                    if member.is_dir():
+                        os.makedirs(target, exist_ok=True)
+                        continue
+                    
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    old_size = _file_size(target)
+                    with zipf.open(member) as src, open(target, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, length=_WRITE_CHUNK)
+                    self._stats_adjust(target, old_size, _file_size(target))
             self.logger.info(f"ZIP arxiv ochildi: {zip_path}")
             return True
         except Exception as e:
             self.logger.error(f"ZIP ochishda xatolik: {e}")
             return False
     
+    @_tracked_write
     def save_json(self, filename: str, data: dict, subdir: str = "") -> bool:
         """JSON formatda saqlash"""
         try:
-            file_path = self.base_dir / subdir / filename
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path = self._p(subdir, filename)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            old_size = _file_size(file_path)
             
+            payload = None
+            if orjson is not None:
+                try:
+                    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                except TypeError:
+                    # orjson qo'llamaydigan turlar (masalan, 64 bitdan katta int) uchun json
+                    payload = None
+                # orjson NaN/Infinity'ni null qilib yozadi; null bo'lmasa tekshirish shart emas
+                if payload is not None and b"null" in payload and _has_non_finite(data):
+                    payload = None
+            
+            if payload is not None:
+                with _atomic_open(file_path, 'wb') as f:
+                    f.write(payload)
+            else:
+                with _atomic_open(file_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=4, ensure_ascii=False)
+            
+            self._stats_adjust(file_path, old_size, _file_size(file_path))
             self.logger.info(f"JSON saqlandi: {file_path}")
             return True
         except Exception as e:
@@ -246,7 +723,17 @@ class FileManager:
     def load_json(self, filename: str, subdir: str = "") -> Optional[dict]:
         """JSON faylni yuklash"""
         try:
-            file_path = self.base_dir / subdir / filename
+            file_path = self._p(subdir, filename)
+            if orjson is not None:
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
+                if _LONG_NUMBER.search(raw):
+                    return json.loads(raw)
+                try:
+                    return orjson.loads(raw)
+                except orjson.JSONDecodeError:
+                    # json.dump yozgan NaN/Infinity'ni orjson o'qiy olmaydi
+                    return json.loads(raw)
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             return data
@@ -254,18 +741,35 @@ class FileManager:
             self.logger.error(f"JSON yuklashda xatolik: {e}")
             return None
     
+    @_tracked_write
     def save_csv(self, filename: str, data: List[List], headers: List[str] = None, subdir: str = "") -> bool:
         """CSV formatda saqlash"""
         try:
-            file_path = self.base_dir / subdir / filename
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path = self._p(subdir, filename)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            
+            old_size = _file_size(file_path)
             
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                if headers:
-                    writer.writerow(headers)
-                writer.writerows(data)
+            written = False
+            if pa is not None and len(data) > _ARROW_CSV_MIN_ROWS:
+                try:
+                    table = _csv_arrow_table(data, headers)
+                    if table is not None:
+                        with _atomic_open(file_path, 'wb') as f:
+                            _write_csv_arrow(f, table, bool(headers))
+                        written = True
+                except Exception as e:
+                    # Eski pyarrow (masalan, eol parametri yo'q) - csv moduli yozadi
+                    self.logger.warning(f"pyarrow CSV yozmadi, csv moduli ishlatiladi: {e}")
             
+            if not written:
+                with _atomic_open(file_path, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    if headers:
+                        writer.writerow(headers)
+                    writer.writerows(data)
+            
+            self._stats_adjust(file_path, old_size, _file_size(file_path))
             self.logger.info(f"CSV saqlandi: {file_path}")
             return True
         except Exception as e:
@@ -275,7 +779,7 @@ class FileManager:
     def load_csv(self, filename: str, subdir: str = "") -> Optional[List[List[str]]]:
         """CSV faylni yuklash"""
         try:
-            file_path = self.base_dir / subdir / filename
+            file_path = self._p(subdir, filename)
             with open(file_path, 'r', encoding='utf-8') as f:
                 reader = csv.reader(f)
                 data = list(reader)
@@ -284,16 +788,153 @@ class FileManager:
             self.logger.error(f"CSV yuklashda xatolik: {e}")
             return None
     
-    def get_storage_stats(self) -> Dict:
-        """Xotira statistikasi"""
+    async def aread_file(self, filename: str, subdir: str = "") -> Optional[str]:
+        """Faylni asinxron o'qish"""
+        return await asyncio.to_thread(self.read_file, filename, subdir)
+    
+    async def acreate_file(self, filename: str, content: str, subdir: str = "") -> bool:
+        """Faylni asinxron yaratish"""
+        return await asyncio.to_thread(self.create_file, filename, content, subdir)
+    
+    async def ahash_file(self, filename: str, subdir: str = "", algorithm: str = "md5") -> Optional[str]:
+        """Fayl hash kodini asinxron olish (mmap'siz - fayl shu payt yozilayotgan bo'lishi mumkin)"""
+        return await asyncio.to_thread(self.get_file_hash, filename, subdir, algorithm, False)
+    
+    def bulk_create(self, files: Dict[str, str], subdir: str = "") -> Dict[str, bool]:
+        """Ko'p fayllarni bir vaqtda yaratish ({nomi: matn})"""
+        if _event_loop_running():
+            with ThreadPoolExecutor() as pool:
+                results = list(pool.map(
+                    lambda item: self.create_file(item[0], item[1], subdir), files.items()
+                ))
+            return dict(zip(files, results))
+        
+        async def run():
+            return await asyncio.gather(*(
+                self.acreate_file(name, content, subdir) for name, content in files.items()
+            ))
+        
+        return dict(zip(files, asyncio.run(run())))
+    
+    def bulk_read(self, filenames: List[str], subdir: str = "") -> Dict[str, Optional[str]]:
+        """Ko'p fayllarni bir vaqtda o'qish"""
+        if _event_loop_running():
+            with ThreadPoolExecutor() as pool:
+                results = list(pool.map(lambda name: self.read_file(name, subdir), filenames))
+            return dict(zip(filenames, results))
+        
+        async def run():
+            return await asyncio.gather(*(self.aread_file(name, subdir) for name in filenames))
+        
+        return dict(zip(filenames, asyncio.run(run())))
+    
+    def _walk_files(self, path):
+        """Papkadagi barcha fayllarni rekursiv qaytarish (os.scandir DirEntry)"""
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._walk_files(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+    
+    def _walk_sizes(self, path):
+        """Papkadagi barcha fayllar hajmini rekursiv qaytarish"""
+        for entry in self._walk_files(path):
+            yield entry.stat(follow_symlinks=False).st_size
+    
+    def _dir_totals(self, path) -> Tuple[int, int]:
+        """Papkadagi fayllar soni va umumiy hajmi"""
+        count = 0
+        size = 0
+        for file_size in self._walk_sizes(path):
+            count += 1
+            size += file_size
+        return count, size
+    
+    def _stats_adjust(self, path: str, old_size: Optional[int], new_size: Optional[int]):
+        """Keshlangan statistikani fayl o'zgarishiga moslash"""
+        # logs/ keshga kirmaydi - u get_storage_stats'da alohida sanaladi
+        if os.path.abspath(path).startswith(self._log_prefix):
+            return
+        with self._stats_cond:
+            if self._stats is None:
+                return
+            self._stats['count'] += (new_size is not None) - (old_size is not None)
+            self._stats['size'] += (new_size or 0) - (old_size or 0)
+    
+    def _scan_storage(self) -> Dict[str, int]:
+        """Loglardan tashqari barcha fayllarni sanash"""
+        total_size = 0
+        file_count = 0
+        subdirs = []
+        log_dir = os.fspath(self.log_dir)
+        
+        with os.scandir(self.base_dir) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path != log_dir:
+                        subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total_size += entry.stat(follow_symlinks=False).st_size
+                    file_count += 1
+        
+        # Bitta papka uchun oqimlar yaratishga arzimaydi
+        if len(subdirs) < 2:
+            partials = map(self._dir_totals, subdirs)
+        else:
+            workers = min(_STATS_WORKERS, len(subdirs))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                partials = list(pool.map(self._dir_totals, subdirs))
+        
+        for count, size in partials:
+            file_count += count
+            total_size += size
+        
+        return {'count': file_count, 'size': total_size}
+    
+    @contextlib.contextmanager
+    def _write_section(self):
+        """Fayl yozish bloki - skanerlash tugashini kutadi va skanerlashni ushlab turadi"""
+        with self._stats_cond:
+            while self._scanning:
+                self._stats_cond.wait()
+            self._active_writes += 1
+        try:
+            yield
+        finally:
+            with self._stats_cond:
+                self._active_writes -= 1
+                self._stats_cond.notify_all()
+    
+    def _rescan_stats(self):
+        """Yozishlar tugashini kutib, keshni qayta skanerlash natijasi bilan almashtirish"""
+        with self._stats_cond:
+            while self._scanning or self._active_writes:
+                self._stats_cond.wait()
+            self._scanning = True
+        stats = None
         try:
-            total_size = 0
-            file_count = 0
+            stats = self._scan_storage()
+        finally:
+            # Kesh yozishlar qayta boshlanishidan oldin almashtiriladi
+            with self._stats_cond:
+                if stats is not None:
+                    self._stats = stats
+                self._scanning = False
+                self._stats_cond.notify_all()
+    
+    def get_storage_stats(self, refresh: bool = False) -> Dict:
+        """Xotira statistikasi (refresh=True bo'lsa papka qayta skanerlanadi)"""
+        try:
+            if refresh or self._stats is None:
+                self._rescan_stats()
+            with self._stats_cond:
+                cached = dict(self._stats)
             
-            for file_path in self.base_dir.rglob("*"):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-                    file_count += 1
+            # Log fayllar FileManager'dan tashqarida o'sadi, shuning uchun har safar sanaladi
+            log_count, log_size = self._dir_totals(self.log_dir)
+            file_count = cached['count'] + log_count
+            total_size = cached['size'] + log_size
             
             return {
                 'total_files': file_count,
@@ -0,0 +1,208 @@
+import csv
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from main import FileManager
+
+
+class ZipRoundTripTest(unittest.TestCase):
+    """create_zip -> extract_zip -> o'qish"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fm = FileManager(os.path.join(self.tmp.name, "storage"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        self.fm.create_file("a.txt", "Salom!", "src")
+        self.fm.create_file("b.txt", "x" * 100000, "src/ichki")
+        self.fm.get_storage_stats()
+
+        self.assertTrue(self.fm.create_zip("arxiv.zip", ["a.txt", "ichki/b.txt"], "src"))
+        self.assertTrue(self.fm.extract_zip("arxiv.zip", "chiqdi", "src"))
+
+        self.assertEqual(self.fm.read_file("a.txt", "src/chiqdi"), "Salom!")
+        self.assertEqual(self.fm.read_file("b.txt", "src/chiqdi/ichki"), "x" * 100000)
+
+        cached = self.fm.get_storage_stats()
+        fresh = self.fm.get_storage_stats(refresh=True)
+        self.assertEqual(cached['total_files'], fresh['total_files'])
+        self.assertEqual(cached['total_size_bytes'], fresh['total_size_bytes'])
+
+    def test_unsafe_member_names_stay_inside(self):
+        zip_path = os.path.join(self.fm._base, "yomon.zip")
+        with zipfile.ZipFile(zip_path, 'w') as zipf:
+            zipf.writestr("../../tashqarida.txt", "a")
+            zipf.writestr("/absolyut/b.txt", "b")
+
+        self.assertTrue(self.fm.extract_zip("yomon.zip", "chiqdi"))
+        self.assertEqual(self.fm.read_file("tashqarida.txt", "chiqdi"), "a")
+        self.assertEqual(self.fm.read_file("b.txt", "chiqdi/absolyut"), "b")
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "tashqarida.txt")))
+
+
+class StorageStatsCacheTest(unittest.TestCase):
+    """Keshlangan statistika qayta skanerlash bilan bir xil bo'lishi kerak"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fm = FileManager(os.path.join(self.tmp.name, "storage"))
+        self.fm.get_storage_stats()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertCacheMatchesScan(self):
+        cached = self.fm.get_storage_stats()
+        fresh = self.fm.get_storage_stats(refresh=True)
+        self.assertEqual(cached['total_files'], fresh['total_files'])
+        self.assertEqual(cached['total_size_bytes'], fresh['total_size_bytes'])
+
+    def test_move_into_directory(self):
+        self.fm.create_file("a.txt", "Salom", "")
+        self.fm.create_file("b.txt", "x", "d/sub")
+        self.assertTrue(self.fm.move_file("a.txt", "d/sub"))
+        self.assertEqual(self.fm.read_file("a.txt", "d/sub"), "Salom")
+        self.assertCacheMatchesScan()
+
+    def test_copy_into_directory(self):
+        self.fm.create_file("a.txt", "Salom", "")
+        os.makedirs(os.path.join(self.fm._base, "d"))
+        self.assertTrue(self.fm.copy_file("a.txt", "d"))
+        self.assertEqual(self.fm.read_file("a.txt", "d"), "Salom")
+        self.assertCacheMatchesScan()
+
+    def test_bulk_create_during_first_scan(self):
+        base = os.path.join(self.tmp.name, "boshqa")
+        # Birinchi skanerlash sezilarli vaqt olishi uchun oldindan fayllar
+        for d in range(4):
+            os.makedirs(os.path.join(base, f"eski{d}"))
+            for i in range(500):
+                with open(os.path.join(base, f"eski{d}", f"{i}.txt"), "w") as f:
+                    f.write("e")
+        fm = FileManager(base)
+        files = {f"f{i}.txt": "x" * i for i in range(300)}
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            created = pool.submit(fm.bulk_create, files, "bulk")
+            pool.submit(fm.get_storage_stats).result()
+            self.assertTrue(all(created.result().values()))
+        self.fm = fm
+        self.assertCacheMatchesScan()
+
+
+class JsonRoundTripTest(unittest.TestCase):
+    """save_json -> load_json ma'lumotni o'zgartirmasligi kerak"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fm = FileManager(os.path.join(self.tmp.name, "storage"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_big_int(self):
+        data = {"a": 2 ** 70, "b": [-(2 ** 65), 1]}
+        self.assertTrue(self.fm.save_json("katta.json", data))
+        self.assertEqual(self.fm.load_json("katta.json"), data)
+
+    def test_non_finite_floats(self):
+        self.assertTrue(self.fm.save_json("nan.json", {"a": float("inf"), "b": None}))
+        loaded = self.fm.load_json("nan.json")
+        self.assertEqual(loaded["a"], float("inf"))
+        self.assertIsNone(loaded["b"])
+
+    def test_unicode(self):
+        data = {"ism": "Ўзбек", "1": [1.5, True]}
+        self.assertTrue(self.fm.save_json("u.json", data))
+        self.assertEqual(self.fm.load_json("u.json"), data)
+
+
+class CsvFormatTest(unittest.TestCase):
+    """save_csv pyarrow bor-yo'qligidan qat'i nazar csv.writer bilan bir xil yozishi kerak"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fm = FileManager(os.path.join(self.tmp.name, "storage"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertSameAsCsvWriter(self, rows, headers=None):
+        expected = io.StringIO(newline='')
+        writer = csv.writer(expected)
+        if headers:
+            writer.writerow(headers)
+        writer.writerows(rows)
+
+        self.assertTrue(self.fm.save_csv("t.csv", rows, headers))
+        with open(os.path.join(self.fm._base, "t.csv"), 'rb') as f:
+            self.assertEqual(f.read(), expected.getvalue().encode('utf-8'))
+
+    def test_large_plain_strings(self):
+        rows = [[str(i), f"ism{i}", "Toshkent", "", None] for i in range(3000)]
+        self.assertSameAsCsvWriter(rows, ["id", "ism", "shahar", "bo'sh", "null"])
+
+    def test_large_needs_quoting(self):
+        rows = [[str(i), 'a,b', 'q"'] for i in range(3000)]
+        self.assertSameAsCsvWriter(rows, ["id", "x", "y"])
+
+    def test_large_mixed_types(self):
+        rows = [[i, 1.5, True, "matn"] for i in range(3000)]
+        self.assertSameAsCsvWriter(rows)
+
+    def test_large_ragged_and_single_column(self):
+        rows = [["a", "b"]] * 1500 + [["c"]] * 1500
+        self.assertSameAsCsvWriter(rows)
+        self.assertSameAsCsvWriter([[""]] * 3000, ["x"])
+
+
+class FileHashTest(unittest.TestCase):
+    """Barcha o'qish yo'llari bir xil hash berishi kerak"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fm = FileManager(os.path.join(self.tmp.name, "storage"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sizes_and_modes(self):
+        for size in (0, 1, 128 * 1024 - 1, 128 * 1024, 3 * 1024 * 1024 + 7):
+            payload = os.urandom(size)
+            with open(os.path.join(self.fm._base, "h.bin"), 'wb') as f:
+                f.write(payload)
+            expected = hashlib.md5(payload).hexdigest()
+            self.assertEqual(self.fm.get_file_hash("h.bin"), expected)
+            self.assertEqual(self.fm.get_file_hash("h.bin", use_mmap=False), expected)
+
+
+class ListFilesTest(unittest.TestCase):
+    """list_files Path.glob bilan bir xil natija berishi kerak"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fm = FileManager(os.path.join(self.tmp.name, "storage"))
+        self.fm.create_file("a.txt", "a", "d")
+        self.fm.create_file("b.json", "{}", "d")
+        self.fm.create_file("c.txt", "c", "d/ichki")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_glob(self):
+        base = Path(self.fm._base) / "d"
+        for pattern in ("*", "*.txt", "?.json", "**", "**/*.txt", "*/c.txt", "[ab].*"):
+            expected = sorted(p.name for p in base.glob(pattern) if p.is_file())
+            self.assertEqual(self.fm.list_files("d", pattern), expected, pattern)
+
+
+if __name__ == "__main__":
+    unittest.main()